@@ -9,6 +9,9 @@ Version: 1.0
 ================================================================================
 """
 
+import os
+import joblib
+import sklearn
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import pandas as pd
@@ -37,10 +40,8 @@ print("="*80)
 
 # Load datasets
 print("📁 Loading datasets...")
-df_compost = pd.read_csv('dtl.csv')
 df_plants = pd.read_csv('plant.csv')
 
-print(f"✓ Compost data: {df_compost.shape[0]} samples")
 print(f"✓ Plant data: {df_plants.shape[0]} species")
 
 # Define features
@@ -51,49 +52,88 @@ FEATURE_NAMES = [
 ]
 TARGET = 'Score'
 
-# Prepare data
-print("\n🔧 Preparing training data...")
-X = df_compost[FEATURE_NAMES].copy()
-y = df_compost[TARGET].copy()
-
-# Handle missing values
-X = X.fillna(X.mean())
-y = y.fillna(y.mean())
-
-# Split data
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# Scale features
-print("📊 Scaling features...")
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-# Train model
-print("🤖 Training Random Forest model...")
-model = RandomForestRegressor(
-    n_estimators=200,
-    max_depth=15,
-    min_samples_split=5,
-    min_samples_leaf=2,
-    random_state=42,
-    n_jobs=-1
-)
-
-model.fit(X_train_scaled, y_train)
-
-# Evaluate
-y_pred = model.predict(X_test_scaled)
-test_r2 = r2_score(y_test, y_pred)
-test_rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-test_mae = mean_absolute_error(y_test, y_pred)
-
-print("\n📈 Model Performance:")
-print(f"  R² Score: {test_r2:.4f}")
-print(f"  RMSE: {test_rmse:.4f}")
-print(f"  MAE: {test_mae:.4f}")
+# Display names for the engines train.py can produce
+MODEL_DISPLAY_NAMES = {
+    'random_forest': "Random Forest Regressor",
+    'hist_gradient_boosting': "Histogram Gradient Boosting Regressor",
+}
+
+# Use the artifact produced by train.py when present, else train inline
+MODEL_PATH = os.environ.get('MODEL_PATH', 'model.joblib')
+
+if os.path.exists(MODEL_PATH):
+    print(f"\n📦 Loading trained model from {MODEL_PATH}...")
+    artifact = joblib.load(MODEL_PATH)
+    if artifact['feature_names'] != FEATURE_NAMES:
+        raise RuntimeError(
+            f"{MODEL_PATH} was trained on features {artifact['feature_names']}, "
+            f"expected {FEATURE_NAMES}. Re-run train.py."
+        )
+    # Pickled estimators are only reliable under the sklearn they were built with
+    if artifact.get('sklearn_version') != sklearn.__version__:
+        raise RuntimeError(
+            f"{MODEL_PATH} was built with scikit-learn {artifact.get('sklearn_version')}, "
+            f"installed version is {sklearn.__version__}. Re-run train.py "
+            f"or pin scikit-learn in requirements.txt."
+        )
+    model = artifact['model']
+    scaler = artifact['scaler']
+    MODEL_NAME = MODEL_DISPLAY_NAMES.get(artifact['engine'], artifact['engine'])
+    TRAINING_SAMPLES = artifact['training_samples']
+    test_r2 = artifact['metrics']['r2_score']
+    test_rmse = artifact['metrics']['rmse']
+    test_mae = artifact['metrics']['mae']
+    print(f"✓ {MODEL_NAME} (cross-validated R² {test_r2:.4f})")
+else:
+    MODEL_NAME = "Random Forest Regressor"
+
+    df_compost = pd.read_csv('dtl.csv')
+    TRAINING_SAMPLES = len(df_compost)
+    print(f"✓ Compost data: {TRAINING_SAMPLES} samples")
+
+    # Prepare data
+    print("\n🔧 Preparing training data...")
+    X = df_compost[FEATURE_NAMES].copy()
+    y = df_compost[TARGET].copy()
+
+    # Handle missing values
+    X = X.fillna(X.mean())
+    y = y.fillna(y.mean())
+
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    # Scale features
+    print("📊 Scaling features...")
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    # Train model
+    print("🤖 Training Random Forest model...")
+    model = RandomForestRegressor(
+        n_estimators=200,
+        max_depth=15,
+        min_samples_split=5,
+        min_samples_leaf=2,
+        random_state=42,
+        n_jobs=-1
+    )
+
+    model.fit(X_train_scaled, y_train)
+
+    # Evaluate
+    y_pred = model.predict(X_test_scaled)
+    test_r2 = r2_score(y_test, y_pred)
+    test_rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+    test_mae = mean_absolute_error(y_test, y_pred)
+
+    print("\n📈 Model Performance:")
+    print(f"  R² Score: {test_r2:.4f}")
+    print(f"  RMSE: {test_rmse:.4f}")
+    print(f"  MAE: {test_mae:.4f}")
 
 # ============================================================================
 # COMPOST ANALYSIS SYSTEM CLASS
@@ -626,14 +666,14 @@ def health():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
-        "model": "Random Forest Regressor",
+        "model": MODEL_NAME,
         "model_performance": {
             "r2_score": round(test_r2, 4),
             "rmse": round(test_rmse, 4),
             "mae": round(test_mae, 4)
         },
         "plants_loaded": len(df_plants),
-        "training_samples": len(df_compost)
+        "training_samples": TRAINING_SAMPLES
     })
 
 # ============================================================================
@@ -641,11 +681,10 @@ def health():
 # ============================================================================
 
 if __name__ == '__main__':
-    import os
     print("\n" + "="*80)
     print("🌱 COMPOST QUALITY ANALYSIS SYSTEM - API SERVER")
     print("="*80)
-    print(f"✓ Model trained with {len(df_compost)} samples")
+    print(f"✓ Model trained with {TRAINING_SAMPLES} samples")
     print(f"✓ Plant database loaded with {len(df_plants)} species")
     
     port = int(os.environ.get('PORT', 5000))
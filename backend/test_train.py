@@ -0,0 +1,82 @@
+"""
+Checks for the offline training pipeline in train.py.
+
+Run from backend/:
+    python -m pytest test_train.py
+"""
+
+import numpy as np
+import pandas as pd
+
+import train
+
+
+def make_csv(path, n_rows=37):
+    """Write a small dataset with gaps in several columns"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.uniform(0, 100, size=(n_rows, len(train.FEATURE_NAMES) + 1)),
+        columns=train.FEATURE_NAMES + [train.TARGET],
+    )
+    df.insert(0, 'Day', np.arange(n_rows))
+    df.loc[[0, 9, 10, 36], 'pH'] = np.nan
+    df.loc[[5, 20], 'GI(%)'] = np.nan
+    df.loc[11, train.TARGET] = np.nan
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_load_dataset_matches_fillna_across_chunks(tmp_path):
+    path = tmp_path / 'data.csv'
+    df = make_csv(path)
+
+    expected_X = df[train.FEATURE_NAMES].fillna(df[train.FEATURE_NAMES].mean())
+    expected_y = df[train.TARGET].fillna(df[train.TARGET].mean())
+
+    # Chunk sizes that split the gaps across chunk boundaries
+    for chunksize in (1, 4, 10, 1000):
+        X, y = train.load_dataset(path, chunksize=chunksize)
+        assert X.dtype == np.float32 and y.dtype == np.float32
+        assert X.shape == expected_X.shape
+        np.testing.assert_allclose(X, expected_X.to_numpy(), rtol=1e-5)
+        np.testing.assert_allclose(y, expected_y.to_numpy(), rtol=1e-5)
+
+
+def test_cross_validate_grid_keeps_candidates_and_folds_aligned(tmp_path, monkeypatch):
+    path = tmp_path / 'data.csv'
+    make_csv(path, n_rows=60)
+    X, y = train.load_dataset(path)
+
+    monkeypatch.setitem(train.PARAM_GRIDS, 'random_forest', {
+        'n_estimators': [5],
+        'max_depth': [2, 4],
+        'min_samples_split': [2],
+        'min_samples_leaf': [2],
+    })
+    monkeypatch.setitem(train.PARAM_GRIDS, 'hist_gradient_boosting', {
+        'learning_rate': [0.1],
+        'max_iter': [5, 10],
+        'max_leaf_nodes': [7],
+        'l2_regularization': [0.0],
+    })
+    folds = 3
+
+    results = train.cross_validate_grid(X, y, list(train.ENGINES), folds=folds, workers=2)
+    assert len(results) == 4
+
+    # Recompute each candidate's folds in-process and compare the accuracy
+    # metrics, which are deterministic unlike the timings
+    from sklearn.model_selection import KFold
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=train.RANDOM_STATE).split(X))
+    train.init_worker(X, y, splits)
+    for result in results:
+        fold_results = [
+            train.evaluate_fold((result['engine'], result['params'], fold))
+            for fold in range(folds)
+        ]
+        expected = train.summarize(fold_results)
+        for key in ('r2', 'rmse', 'mae'):
+            assert result['cv'][key] == expected[key]
+
+    r2_means = [result['cv']['r2']['mean'] for result in results]
+    assert r2_means == sorted(r2_means, reverse=True)